@@ -9,34 +9,37 @@ if TYPE_CHECKING:
 
 NEW_HEADER_MAGIC = b"\xda\xce\xbe\n"
 OLD_HEADER_MAGIC = b"\x00\x00\x00\x0c"
+_MAGIC_FORMAT = {NEW_HEADER_MAGIC: "new", OLD_HEADER_MAGIC: "old"}
 VERSION = re.compile(r"^ND2 FILE SIGNATURE CHUNK NAME01!Ver([\d\.]+)$")
 
 
-def is_supported_file(path):
+def _read_magic(path: str) -> bytes:
+    """Return the first 4 bytes of `path`."""
     with open(path, "rb") as fh:
-        return fh.read(4) in (NEW_HEADER_MAGIC, OLD_HEADER_MAGIC)
+        return fh.read(4)
+
+
+def is_supported_file(path):
+    return _read_magic(str(path)) in _MAGIC_FORMAT
 
 
 def get_reader(path: str) -> Union["ND2Reader", "LegacyND2Reader"]:
-    with open(path, "rb") as fh:
-        magic_num = fh.read(4)
-        if magic_num == NEW_HEADER_MAGIC:
-            from ._sdk.latest import ND2Reader
+    magic_num = _read_magic(str(path))
+    fmt = _MAGIC_FORMAT.get(magic_num)
+    if fmt == "new":
+        from ._sdk.latest import ND2Reader
 
-            return ND2Reader(path)
-        elif magic_num == OLD_HEADER_MAGIC:
-            from ._legacy import LegacyND2Reader
+        return ND2Reader(path)
+    elif fmt == "old":
+        from ._legacy import LegacyND2Reader
 
-            return LegacyND2Reader(path)
-        raise OSError(
-            f"file {path} not recognized as ND2.  First 4 bytes: {magic_num!r}"
-        )
+        return LegacyND2Reader(path)
+    raise OSError(f"file {path} not recognized as ND2.  First 4 bytes: {magic_num!r}")
 
 
 def is_new_format(path: str) -> bool:
     # TODO: this is just for dealing with missing test data
-    with open(path, "rb") as fh:
-        return fh.read(4) == NEW_HEADER_MAGIC
+    return _MAGIC_FORMAT.get(_read_magic(str(path))) == "new"
 
 
 def jdn_to_datetime_local(jdn):
@@ -52,12 +55,13 @@ def rgb_int_to_tuple(rgb):
 
 
 DIMSIZE = re.compile(r"(\w+)'?\((\d+)\)")
+DIMENSIONS = re.compile(r"Dimensions:\s?([^\r]+)\r?\n")
 
 
 def dims_from_description(desc) -> dict:
     if not desc:
         return {}
-    match = re.search(r"Dimensions:\s?([^\r]+)\r?\n", desc)
+    match = DIMENSIONS.search(desc)
     if not match:
         return {}
     dims = match.groups()[0]
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-import mmap
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from itertools import product
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Sequence, Set, Union, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
 
 import numpy as np
 
@@ -16,9 +25,18 @@ try:
 except ImportError:
     cached_property = property  # type: ignore
 
+try:
+    from math import prod
+except ImportError:
+    from functools import reduce
+    from operator import mul
+
+    def prod(iterable):  # type: ignore
+        return reduce(mul, iterable, 1)
+
 
 if TYPE_CHECKING:
-    from typing import Any, Dict, List, Tuple
+    from typing import Any, List
 
     import dask.array as da
     import xarray as xr
@@ -26,6 +44,7 @@ if TYPE_CHECKING:
 
 
 Index = Union[int, slice]
+FRAME_COORDS = frozenset({AXIS.X, AXIS.Y, AXIS.CHANNEL, AXIS.RGB})
 
 
 class ReadMode(str, Enum):
@@ -33,8 +52,22 @@ class ReadMode(str, Enum):
     SDK = "sdk"
 
 
+class _SizeInfo(NamedTuple):
+    """Shape information derived once from the file attributes."""
+
+    sizes: Dict[str, int]
+    shape: Tuple[int, ...]
+    coord_shape: Tuple[int, ...]
+    coord_strides: Tuple[int, ...]
+    frame_shape: Tuple[int, ...]
+    frame_count: int
+    raw_frame_shape: Tuple[int, int, int, int]
+    dtype: np.dtype
+    needs_transpose: bool
+    squeeze_shape: Tuple[int, ...]
+
+
 class ND2File:
-    _memmap: mmap.mmap
     _is_legacy: bool
 
     def __init__(self, path: Union[Path, str]) -> None:
@@ -122,15 +155,31 @@ class ND2File:
         """number of dimensions"""
         return len(self.shape)
 
-    @cached_property
+    @property
     def shape(self) -> Tuple[int, ...]:
         """size of each axis"""
-        return self._coord_shape + self._frame_shape
+        return self._size_info.shape
 
-    @cached_property
+    @property
     def sizes(self) -> Dict[str, int]:
         """names and sizes for each axis"""
+        return self._size_info.sizes
+
+    @property
+    def _size_info(self) -> _SizeInfo:
+        """Sizes, shapes, and dtype; computed once on first access."""
+        # cached by hand: on python 3.7 `cached_property` falls back to `property`,
+        # which would redo this on every frame/block read.
+        try:
+            return self.__dict__["_size_info_cache"]
+        except KeyError:
+            info = self.__dict__["_size_info_cache"] = self._compute_size_info()
+            return info
+
+    def _compute_size_info(self) -> _SizeInfo:
+        """Compute sizes, shapes, and dtype in a single pass over the attributes."""
         attrs = cast(Attributes, self.attributes)
+        n_components = attrs.componentCount // (attrs.channelCount or 1)
 
         # often, the 'Description' field in textinfo is the best source of dimension
         # (dims are strangely missing from coord_info sometimes)
@@ -148,19 +197,46 @@ class ND2File:
         )
         dims[AXIS.Y] = attrs.heightPx
         dims[AXIS.X] = attrs.widthPx or -1
-        if self.components_per_channel == 3:  # rgb
-            dims[AXIS.RGB] = self.components_per_channel
+        if n_components == 3:  # rgb
+            dims[AXIS.RGB] = n_components
         else:
             # if not exactly 3 channels, throw them all into monochrome channels
             dims[AXIS.CHANNEL] = attrs.componentCount
-        return {k: v for k, v in dims.items() if v != 1}
+        sizes = {k: v for k, v in dims.items() if v != 1}
+
+        coord_shape = tuple(v for k, v in sizes.items() if k not in FRAME_COORDS)
+        frame_shape = tuple(v for k, v in sizes.items() if k in FRAME_COORDS)
+        raw_frame_shape = (
+            attrs.heightPx,
+            attrs.widthPx or -1,
+            attrs.channelCount or 1,
+            n_components,
+        )
+        # C-order strides of the coord axes (in frames), for _seq_index_from_coords
+        coord_strides = [1] * len(coord_shape)
+        for i in range(len(coord_shape) - 2, -1, -1):
+            coord_strides[i] = coord_strides[i + 1] * coord_shape[i + 1]
+        d = attrs.pixelDataType[0] if attrs.pixelDataType else "u"
+        return _SizeInfo(
+            sizes=sizes,
+            shape=coord_shape + frame_shape,
+            coord_shape=coord_shape,
+            coord_strides=tuple(coord_strides),
+            frame_shape=frame_shape,
+            frame_count=prod(coord_shape),
+            raw_frame_shape=raw_frame_shape,
+            dtype=np.dtype(f"{d}{attrs.bitsPerComponentInMemory // 8}"),
+            # monochrome frames can skip the transpose and just drop singletons
+            needs_transpose=raw_frame_shape[2] > 1 or n_components > 1,
+            squeeze_shape=tuple(x for x in raw_frame_shape if x != 1),
+        )
 
-    @property
+    @cached_property
     def is_rgb(self) -> bool:
         """Whether the image is rgb"""
         return self.components_per_channel in (3, 4)
 
-    @property
+    @cached_property
     def components_per_channel(self) -> int:
         """Number of components per channel (e.g. 3 for rgb)"""
         attrs = cast(Attributes, self.attributes)
@@ -169,22 +245,24 @@ class ND2File:
     @property
     def size(self) -> int:
         """Total number of pixels in the volume."""
-        return int(np.prod(self.shape))
+        return prod(self._size_info.shape)
 
     @property
     def nbytes(self) -> int:
         """Total bytes of image data."""
         return self.size * self.dtype.itemsize
 
-    @cached_property
+    @property
     def dtype(self) -> np.dtype:
         """Image data type"""
-        attrs = self.attributes
-        d = attrs.pixelDataType[0] if attrs.pixelDataType else "u"
-        return np.dtype(f"{d}{attrs.bitsPerComponentInMemory // 8}")
+        return self._size_info.dtype
 
     def voxel_size(self, channel: int = 0) -> VoxelSize:
         """XYZ voxel size."""
+        return self._voxel_size
+
+    @cached_property
+    def _voxel_size(self) -> VoxelSize:
         return VoxelSize(*self._rdr.voxel_size())
 
     def asarray(self, position: Optional[int] = None) -> np.ndarray:
@@ -229,16 +307,32 @@ class ND2File:
                         f"Only {self.sizes[AXIS.POSITION]} positions available"
                     )
 
-                ranges: List[Union[range, tuple]] = [
-                    range(x) for x in self._coord_shape
-                ]
-                ranges[pidx] = (position,)
-                coords = list(zip(*product(*ranges)))
+                axes = [np.arange(x) for x in self._coord_shape]
+                axes[pidx] = np.array([position])
+                grids = np.meshgrid(*axes, indexing="ij")
+                coords = [g.ravel() for g in grids]
                 seqs = self._seq_index_from_coords(coords)  # type: ignore
                 final_shape[pidx] = 1
 
-        arr = np.stack([self._get_frame(i) for i in seqs])
-        return arr.reshape(final_shape)
+        # size the buffer from a decoded frame: its layout may differ from
+        # `_frame_shape` (only the element count is guaranteed to match)
+        first = self._get_frame(seqs[0])
+        out = np.empty((len(seqs),) + first.shape, dtype=first.dtype)
+        out[0] = first
+
+        def _fill(i: int) -> None:
+            out[i] = self._get_frame(seqs[i])
+
+        if self._is_legacy and len(seqs) > 1:
+            # JPEG2000 decoding dominates legacy reads, so decode frames in threads;
+            # each writes its own slice of `out` (file access is locked by the reader)
+            with ThreadPoolExecutor(max_workers=min(8, len(seqs) - 1)) as pool:
+                list(pool.map(_fill, range(1, len(seqs))))
+        else:
+            # new format frames are mmap views: a plain copy is cheaper than a future
+            for i in range(1, len(seqs)):
+                _fill(i)
+        return out.reshape(final_shape)
 
     def __array__(self) -> np.ndarray:
         """array protocol"""
@@ -252,7 +346,8 @@ class ND2File:
         copy : bool, optional
             Whether to copy buffer when reading, by default True.
             (False may be faster in some cases, but is also prone to segfaults if the
-            file is closed.)
+            file is closed.)  Legacy files always return freshly decoded frames, so
+            no copy is made for them regardless.
 
         Returns
         -------
@@ -272,15 +367,26 @@ class ND2File:
     _NO_IDX = -1
 
     def _seq_index_from_coords(self, coords: Sequence) -> Union[int, Sequence[int]]:
-        if not self._coord_shape:
+        info = self._size_info
+        if not info.coord_shape:
             return self._NO_IDX
-        return np.ravel_multi_index(coords, self._coord_shape)
+        if isinstance(coords, tuple):
+            # single (e.g. dask block) coordinate: skip numpy dispatch,
+            # but validate it the way np.ravel_multi_index would
+            if len(coords) != len(info.coord_shape):
+                raise ValueError(
+                    f"coords must be a sequence of length {len(info.coord_shape)}"
+                )
+            if not all(0 <= c < n for c, n in zip(coords, info.coord_shape)):
+                raise ValueError(f"coords {coords} out of range for {info.coord_shape}")
+            return sum(c * s for c, s in zip(coords, info.coord_strides))
+        return np.ravel_multi_index(coords, info.coord_shape)
 
     def _dask_block(self, copy, block_id: Tuple[int]) -> np.ndarray:
         if isinstance(block_id, np.ndarray):
             return
 
-        ncoords = len(self._coord_shape)
+        ncoords = len(self._size_info.coord_shape)
         idx = self._seq_index_from_coords(block_id[:ncoords])
 
         if idx == self._NO_IDX:
@@ -288,7 +394,9 @@ class ND2File:
                 raise ValueError(f"Cannot get chunk {block_id} for single frame image.")
             idx = 0
         data = self._get_frame(cast(int, idx))[(np.newaxis,) * ncoords]
-        return data.copy() if copy else data
+        # legacy frames are decoded into new arrays, so only the (mmap-backed)
+        # frames from the new format need copying to outlive the open file.
+        return data.copy() if copy and not self._is_legacy else data
 
     def to_xarray(
         self, delayed: bool = True, squeeze: bool = True, position: Optional[int] = None
@@ -343,42 +451,48 @@ class ND2File:
             x = x.isel({AXIS.POSITION: [position]})
         return x.squeeze() if squeeze else x
 
-    @property
-    def _frame_coords(self) -> Set[str]:
-        return {AXIS.X, AXIS.Y, AXIS.CHANNEL, AXIS.RGB}
-
     @property
     def _raw_frame_shape(self) -> Tuple[int, int, int, int]:
         """sizes of each frame coordinate, prior to reshape"""
-        attr = self.attributes
-        return (
-            attr.heightPx,
-            attr.widthPx or -1,
-            attr.channelCount or 1,
-            self.components_per_channel,
-        )
+        return self._size_info.raw_frame_shape
 
     @property
     def _frame_shape(self) -> Tuple[int, ...]:
         """sizes of each frame coordinate, after reshape & squeeze"""
-        return tuple(v for k, v in self.sizes.items() if k in self._frame_coords)
+        return self._size_info.frame_shape
 
-    @cached_property
+    @property
     def _coord_shape(self) -> Tuple[int, ...]:
         """sizes of each *non-frame* coordinate"""
-        return tuple(v for k, v in self.sizes.items() if k not in self._frame_coords)
+        return self._size_info.coord_shape
 
     @property
     def _frame_count(self) -> int:
-        return int(np.prod(self._coord_shape))
+        return self._size_info.frame_count
 
     def _get_frame(self, index: int) -> np.ndarray:
+        # for new-format files this is a zero-copy view into the reader's mmap
         frame = self._rdr._read_image(index)
-        frame.shape = self._raw_frame_shape
+        info = self._size_info
+        if not info.needs_transpose:
+            return frame.reshape(info.squeeze_shape)
+        frame.shape = info.raw_frame_shape
         return frame.transpose((2, 0, 1, 3)).squeeze()
 
     def _expand_coords(self, squeeze=True) -> dict:
         """Return a dict that can be used as the coords argument to xr.DataArray"""
+        # shallow copy, so callers can replace entries without altering the cache
+        return dict(self._squeezed_coords if squeeze else self._full_coords)
+
+    @cached_property
+    def _squeezed_coords(self) -> dict:
+        return self._build_coords(squeeze=True)
+
+    @cached_property
+    def _full_coords(self) -> dict:
+        return self._build_coords(squeeze=False)
+
+    def _build_coords(self, squeeze=True) -> dict:
         dx, dy, dz = self.voxel_size()
 
         coords = {
@@ -397,7 +511,7 @@ class ND2File:
                 coords[AXIS.TIME] = np.arange(c.count) * c.parameters.periodMs
             elif c.type == "NETimeLoop":
                 pers = [np.arange(p.count) * p.periodMs for p in c.parameters.periods]
-                coords[AXIS.TIME] = np.hstack(pers)
+                coords[AXIS.TIME] = np.concatenate(pers)
             elif c.type == "XYPosLoop":
                 coords[AXIS._MAP["XYPosLoop"]] = self._position_names(c)
 
@@ -416,15 +530,17 @@ class ND2File:
 
     def _position_names(self, loop: Optional[XYPosLoop] = None) -> List[str]:
         if loop is None:
-            for c in self.experiment:
-                if c.type == "XYPosLoop":
-                    loop = c
-                    break
-        if loop is None:
-            return ["XYPos:0"]
+            return self._default_position_names
         return [p.name or f"XYPos:{i}" for i, p in enumerate(loop.parameters.points)]
 
-    @property
+    @cached_property
+    def _default_position_names(self) -> List[str]:
+        for c in self.experiment:
+            if c.type == "XYPosLoop":
+                return self._position_names(c)
+        return ["XYPos:0"]
+
+    @cached_property
     def _channel_names(self) -> List[str]:
         return self._rdr.channel_names()
 
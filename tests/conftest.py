@@ -7,12 +7,40 @@ from nd2._util import is_new_format
 
 DATA = Path(__file__).parent / "data"
 MAX_FILES = None
-ALL = sorted(DATA.glob("*.nd2"), key=lambda x: x.stat().st_size)[:MAX_FILES]
+STATS = {x: x.stat() for x in DATA.glob("*.nd2")}
+ALL = sorted(STATS, key=lambda x: STATS[x].st_size)[:MAX_FILES]
 NEW: List[Path] = []
 OLD: List[Path] = []
+# pytest cache key for {path: [mtime_ns, size, is_new]}, so unchanged files
+# aren't reopened to read their header
+MAGIC_CACHE_KEY = "nd2/header_magic"
 
-for x in ALL:
-    NEW.append(x) if is_new_format(str(x)) else OLD.append(x)
+
+def pytest_configure(config):
+    # config.cache is missing when run with `-p no:cacheprovider`
+    cache = getattr(config, "cache", None)
+    known = cache.get(MAGIC_CACHE_KEY, {}) if cache is not None else {}
+    updated = {}
+    for x in ALL:
+        st = STATS[x]
+        key = str(x)
+        entry = known.get(key)
+        if entry and entry[:2] == [st.st_mtime_ns, st.st_size]:
+            is_new = entry[2]
+        else:
+            is_new = is_new_format(key)
+        updated[key] = [st.st_mtime_ns, st.st_size, is_new]
+        NEW.append(x) if is_new else OLD.append(x)
+    if cache is not None and updated != known:
+        cache.set(MAGIC_CACHE_KEY, updated)
+
+
+def pytest_generate_tests(metafunc):
+    # parametrized here rather than with fixture params, since NEW/OLD are only
+    # populated once the pytest cache is available (in pytest_configure)
+    for name, files in (("any_nd2", ALL), ("new_nd2", NEW), ("old_nd2", OLD)):
+        if name in metafunc.fixturenames:
+            metafunc.parametrize(name, files, ids=lambda x: x.name, indirect=True)
 
 
 @pytest.fixture
@@ -20,17 +48,17 @@ def single_nd2():
     return DATA / "dims_rgb_t3p2c2z3x64y64.nd2"
 
 
-@pytest.fixture(params=ALL, ids=lambda x: x.name)
+@pytest.fixture
 def any_nd2(request):
     return request.param
 
 
-@pytest.fixture(params=NEW, ids=lambda x: f"{x.name}")
+@pytest.fixture
 def new_nd2(request):
     return request.param
 
 
-@pytest.fixture(params=OLD, ids=lambda x: x.name)
+@pytest.fixture
 def old_nd2(request):
     return request.param
 
@@ -195,3 +195,115 @@ def _common_entries(*dcts):
         return
     for i in set(dcts[0]).intersection(*dcts[1:]):
         yield tuple(d[i] for d in dcts)
+
+
+def test_supported_file_not_stale(tmp_path: Path):
+    from nd2._util import NEW_HEADER_MAGIC, is_new_format
+
+    p = tmp_path / "file.nd2"
+    p.write_bytes(b"")
+    assert not ND2File.is_supported_file(p)
+    p.write_bytes(NEW_HEADER_MAGIC)
+    assert ND2File.is_supported_file(p)
+    assert is_new_format(str(p))
+
+
+class _FakeReader:
+    """Data-free stand-in for the SDK/legacy readers."""
+
+    def __init__(self, attributes, coord_info=(), width=None):
+        self.attributes = attributes
+        self._coord_info_ = list(coord_info)
+        a = attributes
+        nc = a.channelCount or 1
+        self._shape = (a.heightPx, width or a.widthPx, nc, a.componentCount // nc)
+        self.n_reads = 0
+
+    def _coord_info(self):
+        return self._coord_info_
+
+    def text_info(self):
+        return {}
+
+    def experiment(self):
+        return []
+
+    def _read_image(self, index):
+        self.n_reads += 1
+        return np.full(self._shape, index, dtype="uint16")
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _fake_nd2(
+    coord_info=(("TimeLoop", 3),), width=None, legacy=False, **attrs
+) -> ND2File:
+    attrs = {
+        "bitsPerComponentInMemory": 16,
+        "bitsPerComponentSignificant": 16,
+        "componentCount": 1,
+        "heightPx": 4,
+        "widthPx": 5,
+        "pixelDataType": "unsigned",
+        "sequenceCount": 1,
+        "channelCount": 1,
+        **attrs,
+    }
+    info = [(i, t, n) for i, (t, n) in enumerate(coord_info)]
+    nd = ND2File.__new__(ND2File)
+    nd._path = "fake.nd2"
+    nd._closed = False
+    nd._is_legacy = legacy
+    nd._rdr = _FakeReader(structures.Attributes(**attrs), info, width)  # type: ignore
+    return nd
+
+
+@pytest.mark.parametrize(
+    "attrs",
+    [
+        {"widthPx": None},
+        {"componentCount": 4, "channelCount": 1},
+        {"componentCount": 4, "channelCount": 2},
+        {"componentCount": 3, "channelCount": 1},
+    ],
+)
+def test_asarray_frame_layout(attrs):
+    nd = _fake_nd2(width=5, **attrs)
+    arr = nd.asarray()
+    assert arr.ndim == nd.ndim
+    assert arr.size == 3 * 4 * 5 * attrs.get("componentCount", 1)
+    # each frame lands in its own slice of the output, in order
+    for i, frame in enumerate(arr.reshape(3, -1)):
+        assert (frame == i).all()
+
+
+@pytest.mark.parametrize("legacy", [True, False])
+def test_asarray_threaded_legacy(legacy, monkeypatch):
+    import nd2.nd2file
+
+    if not legacy:
+        # new-format frames are mmap views; they shouldn't go through the pool
+        monkeypatch.setattr(nd2.nd2file, "ThreadPoolExecutor", None)
+    nd = _fake_nd2(coord_info=[("TimeLoop", 7), ("ZStackLoop", 5)], legacy=legacy)
+    arr = nd.asarray()
+    assert arr.shape == (7, 5, 4, 5)
+    assert nd._rdr.n_reads == 35
+    np.testing.assert_array_equal(arr[..., 0, 0], np.arange(35).reshape(7, 5))
+
+
+def test_seq_index_from_coords():
+    nd = _fake_nd2(coord_info=[("TimeLoop", 3), ("XYPosLoop", 2), ("ZStackLoop", 4)])
+    assert nd._coord_shape == (3, 2, 4)
+    for coords in np.ndindex(*nd._coord_shape):
+        expected = np.ravel_multi_index(coords, nd._coord_shape)
+        assert nd._seq_index_from_coords(coords) == expected
+    for bad in [(1, 1), (1, 1, 1, 1), (3, 0, 0), (0, -1, 0)]:
+        with pytest.raises(ValueError):
+            nd._seq_index_from_coords(bad)
+
+    # single-frame files have no coords to index
+    assert _fake_nd2(coord_info=[])._seq_index_from_coords(()) == ND2File._NO_IDX